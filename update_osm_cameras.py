@@ -1,16 +1,114 @@
 #!/usr/bin/env python3
+import asyncio
+import gzip
+import hashlib
+import ijson
+import io
+import multiprocessing
 import os
 import requests
+import urllib3
 import json
+import random
+import tempfile
+import threading
 import time
+import traceback
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # fall back to the (slower) standard library encoder
+    orjson = None
 
 # Configuration
 CONF_FIXED = 80
 CONF_MOBILE_POSSIBLE = 60
-OVERPASS_URL = "https://lz4.overpass-api.de/api/interpreter"
+OVERPASS_MIRRORS = [
+    "https://lz4.overpass-api.de/api/interpreter",
+    "https://overpass.kumi.systems/api/interpreter",
+    "https://overpass.private.coffee/api/interpreter",
+]
+MIRROR_FAILURE_THRESHOLD = 5
 OUTPUT_DIR = "docs"
+MAX_CONCURRENT_FETCHES = 4
+MAX_PARSE_WORKERS = 4
+MAX_BACKOFF = 300
+MAX_SPLIT_DEPTH = 3  # a bbox Overpass cannot finish is split into quadrants at most this many times
+
+# On-disk cache of Overpass responses, keyed by query hash. Kept outside
+# OUTPUT_DIR so it is never published with the feed.
+CACHE_DIR = ".overpass_cache"
+CACHE_VERSION = 3  # bump when the cached payload format changes
+CACHE_TTL = int(os.environ.get("CACHE_TTL", 12 * 3600))
+FORCE_REFRESH = os.environ.get("FORCE_REFRESH", "").strip().lower() in ("1", "true", "yes")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Shared session so every Overpass call reuses pooled keep-alive connections.
+# Retries are handled in fetch_bbox, so the adapter itself never retries.
+# Response bodies are kept compressed until parse_payload decodes them.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+SESSION.headers.update({"Accept-Encoding": "gzip", "User-Agent": "osm-cameras-feed/1.0"})
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: tokens refill at `rate` per second up to `capacity`,
+    and acquire() blocks until one is available.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+# Global limit on Overpass requests shared by all fetchers: ~1 req/sec with bursts of 2.
+BUCKET = TokenBucket(1.0, 2)
+
+class MirrorPool:
+    """
+    Rotates between Overpass mirrors. Each 429/5xx or connection failure is counted
+    against the mirror, and a mirror with `threshold` failures is demoted for the
+    rest of the run (unless every mirror has been demoted).
+    """
+    def __init__(self, urls, threshold):
+        self.urls = urls
+        self.threshold = threshold
+        self.failures = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def pick(self, index):
+        with self.lock:
+            healthy = [u for u in self.urls if self.failures[u] < self.threshold] or self.urls
+            return healthy[index % len(healthy)]
+
+    def report_failure(self, url):
+        with self.lock:
+            self.failures[url] += 1
+            if self.failures[url] == self.threshold:
+                print(f"    Demoting mirror {url} after {self.threshold} failures.")
+
+MIRRORS = MirrorPool(OVERPASS_MIRRORS, MIRROR_FAILURE_THRESHOLD)
+
 COUNTRY_BBOXES = {
     "uk": [
         (49.9, -8.6, 55.0, -2.0),
@@ -41,40 +139,438 @@ COUNTRY_BBOXES = {
     "nz": [(-47.3, 166.3, -34.4, 178.7)],
 }
 
-def fetch_bbox(bbox, timeout=180, attempts=6):
+# Output file per country; UK keeps "osm_cameras.json" to maintain backward compatibility
+OUTPUTS = {
+    cc: os.path.join(OUTPUT_DIR, "osm_cameras.json" if cc == "uk" else f"{cc}_osm_cameras.json")
+    for cc in COUNTRY_BBOXES
+}
+# Safety guard: no two countries may share a file, and only UK may write the canonical one
+assert len(set(OUTPUTS.values())) == len(OUTPUTS), "two countries map to the same output file"
+assert all(cc == "uk" for cc, path in OUTPUTS.items() if os.path.basename(path) == "osm_cameras.json"), \
+    "only UK may write the canonical osm_cameras.json"
+
+def parse_retry_after(value):
+    """
+    Convert a Retry-After header (delay-seconds or HTTP-date) to seconds.
+    Returns None when the header is missing or unparseable.
+    """
+    if not value:
+        return None
+    try:
+        return max(0, int(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def jittered(backoff):
+    """
+    Scale a backoff delay by a random factor in [0.5, 1.5] so concurrent
+    fetchers do not retry in lockstep.
+    """
+    return min(backoff * random.uniform(0.5, 1.5), MAX_BACKOFF)
+
+def cache_path(query):
+    key = hashlib.sha1(f"{CACHE_VERSION}:{query}".encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+def prune_cache():
+    """
+    Delete expired cache entries so stale queries do not accumulate across runs.
+    """
+    if not os.path.isdir(CACHE_DIR):
+        return
+    now = time.time()
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            if now - os.path.getmtime(path) >= CACHE_TTL:
+                os.remove(path)
+        except OSError:
+            pass
+
+def load_cached(path):
+    """
+    Return the cached response at path if it is younger than CACHE_TTL, else None.
+    """
+    if FORCE_REFRESH:
+        return None
+    try:
+        if time.time() - os.path.getmtime(path) >= CACHE_TTL:
+            return None
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+def write_atomic(path, data):
+    """
+    Write bytes to path through a temp file in the same directory and os.replace,
+    so readers only ever see the previous file or the complete new one.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600; outputs are published
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def file_matches(path, data):
     """
-    Fetch Overpass data for a single bbox with retries and exponential backoff.
-    Treat 429 specially by backing off longer.
+    True if path already holds exactly these bytes (the size is compared before reading).
     """
-    query = f"""
-    [out:json][timeout:{timeout}];
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as fh:
+            return fh.read() == data
+    except OSError:
+        return False
+
+def store_cached(path, data):
+    """
+    Atomically write a response to the cache so an interrupted run never leaves a truncated entry.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        write_atomic(path, json.dumps(data).encode())
+    except OSError as e:
+        print(f"    Warning: could not write cache entry {path}: {e}")
+
+def build_overpass_query(bbox, timeout=180):
+    # The global [bbox:...] setting applies to every statement, so the
+    # coordinates are formatted once instead of being repeated per tag filter.
+    # Fixed precision also keeps split quadrants free of float noise like 52.050000000000004.
+    # "out body" is the smallest mode that still carries lat/lon and tags for
+    # nodes ("out tags" drops coordinates); "qt" skips the server-side id sort.
+    box = ",".join(f"{v:.6f}" for v in bbox)
+    return f"""
+    [out:json][timeout:{timeout}][bbox:{box}];
     (
-      node["highway"="speed_camera"]({bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]});
-      node["camera:type"="mobile"]({bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]});
-      node["radar"="yes"]({bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]});
+      node["highway"="speed_camera"];
+      node["camera:type"="mobile"];
+      node["radar"="yes"];
     );
-    out;
+    out body qt;
+    """
+
+def camera_from_node(node):
+    """
+    Convert an Overpass node into a camera row: (id, lat, lon, type, confidence).
     """
+    tags = node.get("tags", {})
+    if tags.get("highway") == "speed_camera":
+        camera_type = "fixed_camera"
+        conf = CONF_FIXED
+    else:
+        camera_type = "mobile_possible_camera"
+        conf = CONF_MOBILE_POSSIBLE
+
+    return (f"osm-{node['id']}", node.get("lat"), node.get("lon"), camera_type, conf)
+
+class CameraColumns:
+    """
+    Column-oriented store of one country's cameras, de-duplicated by id.
+    Rows are kept as parallel lists rather than one dict per camera; dicts are
+    only built transiently by records() when the output file is written.
+    """
+    FIELDS = ("id", "lat", "lon", "type", "confidence")
+
+    def __init__(self):
+        self.seen = set()
+        self.ids = []
+        self.lats = []
+        self.lons = []
+        self.types = []
+        self.confs = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, row):
+        cid, lat, lon, camera_type, conf = row
+        if cid in self.seen:
+            return
+        self.seen.add(cid)
+        self.ids.append(cid)
+        self.lats.append(lat)
+        self.lons.append(lon)
+        self.types.append(camera_type)
+        self.confs.append(conf)
+
+    def records(self):
+        columns = (self.ids, self.lats, self.lons, self.types, self.confs)
+        return [dict(zip(self.FIELDS, values)) for values in zip(*columns)]
+
+class OverpassRuntimeError(Exception):
+    """
+    Overpass aborted the query (e.g. timeout or out of memory) and returned partial data.
+    """
+
+class BboxTooLarge(Exception):
+    """
+    Overpass could not finish the query for this bbox; its quadrants should be fetched instead.
+    """
+
+class OverpassPayloadError(Exception):
+    """
+    The response body could not be decompressed or parsed as JSON.
+    """
+
+def iter_elements(fh, remarks):
+    """
+    Incrementally parse the "elements" array of an Overpass JSON response.
+    The top-level "remark", where Overpass reports runtime errors, is appended to remarks.
+    """
+    builder = None
+    for prefix, event, value in ijson.parse(fh, use_float=True):
+        if prefix == "elements.item" and event == "start_map":
+            builder = ijson.ObjectBuilder()
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == "elements.item" and event == "end_map":
+                yield builder.value
+                builder = None
+        elif prefix == "remark" and event == "string":
+            remarks.append(value)
+
+def open_payload(body, content_encoding):
+    # Only gzip is requested (see SESSION), and GzipFile decompresses as it is read
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding == "gzip":
+        return gzip.GzipFile(fileobj=io.BytesIO(body))
+    if encoding == "identity":
+        return io.BytesIO(body)
+    raise OverpassPayloadError(f"unsupported Content-Encoding: {content_encoding}")
+
+def parse_payload(body, content_encoding):
+    """
+    Decompress and parse a raw Overpass response body into (camera rows, remarks).
+    Runs in a worker process, decompressing as it parses so the decoded text is never held whole.
+    """
+    remarks = []
+    try:
+        with open_payload(body, content_encoding) as fh:
+            cameras = [camera_from_node(node) for node in iter_elements(fh, remarks)]
+    except (ijson.JSONError, OSError, EOFError, zlib.error) as e:  # zlib.error: corrupt gzip data
+        raise OverpassPayloadError(f"could not decode response: {e}") from e
+    return cameras, remarks
+
+def split_bbox(b):
+    lat_m = (b[0] + b[2]) / 2
+    lon_m = (b[1] + b[3]) / 2
+    return [
+        (b[0], b[1], lat_m, lon_m),
+        (b[0], lon_m, lat_m, b[3]),
+        (lat_m, b[1], b[2], lon_m),
+        (lat_m, lon_m, b[2], b[3]),
+    ]
+
+def is_query_too_large(e):
+    """
+    True if the failure means Overpass could not finish the query in time,
+    so retrying the identical bbox is unlikely to help.
+    """
+    if isinstance(e, (OverpassRuntimeError, requests.exceptions.ReadTimeout, urllib3.exceptions.ReadTimeoutError)):
+        return True
+    response = getattr(e, "response", None)
+    return isinstance(e, requests.exceptions.HTTPError) and response is not None and response.status_code == 504
+
+def is_mirror_failure(e):
+    """
+    True if the failure points at the mirror itself (unreachable or 5xx) rather than the query.
+    """
+    if isinstance(e, requests.exceptions.ConnectionError):
+        return True
+    response = getattr(e, "response", None)
+    return isinstance(e, requests.exceptions.HTTPError) and response is not None and response.status_code >= 500
+
+def dump_json(data):
+    """
+    Serialize data as 2-space indented JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+def fetch_bbox(bbox, timeout=180, attempts=6, depth=0, pool=None):
+    """
+    Fetch the cameras in a single bbox with retries and exponential backoff.
+    The body is downloaded still compressed and parsed by parse_payload, in `pool`
+    (a process pool) when given so JSON decoding does not contend for the GIL.
+    Fresh cached responses (including those of split quadrants) are returned without a request.
+    Returns a list of camera rows (also written to the on-disk cache), or None on failure.
+    On 429/503 wait for the server's Retry-After if given, otherwise back off with jitter.
+    If Overpass times out on the bbox, BboxTooLarge is raised so the caller can fetch its
+    quadrants instead (up to MAX_SPLIT_DEPTH levels).
+    Throttled or failing mirrors are rotated out in favour of the next one in MIRRORS.
+    """
+    query = build_overpass_query(bbox, timeout)
+    cached = load_cached(cache_path(query))
+    if cached is not None:
+        print(f"  Using cached response for bbox {bbox}")
+        return cached
+
     backoff = 5
+    mirror = 0
     for attempt in range(1, attempts + 1):
+        url = MIRRORS.pick(mirror)
         try:
-            print(f"  Fetching bbox {bbox} (attempt {attempt}/{attempts})...")
-            resp = requests.get(OVERPASS_URL, params={"data": query}, timeout=timeout + 30)
-            if resp.status_code == 429:
-                print(f"    Received 429 Too Many Requests (attempt {attempt}). Backing off {backoff}s.")
-                time.sleep(backoff)
-                backoff *= 2
-                continue
-            resp.raise_for_status()
-            return resp.json()
-        except requests.exceptions.RequestException as e:
+            print(f"  Fetching bbox {bbox} from {url} (attempt {attempt}/{attempts})...")
+            BUCKET.acquire()
+            with SESSION.post(url, data={"data": query}, timeout=timeout + 30, stream=True) as resp:
+                if resp.status_code in (429, 503):
+                    MIRRORS.report_failure(url)
+                    mirror += 1
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    if retry_after is not None:
+                        wait = min(retry_after, MAX_BACKOFF)
+                    else:
+                        wait = jittered(backoff)
+                        backoff = min(backoff * 2, MAX_BACKOFF)
+                    if attempt < attempts:
+                        print(f"    Received {resp.status_code} (attempt {attempt}). Backing off {wait:.0f}s.")
+                        time.sleep(wait)
+                    else:
+                        print(f"    Received {resp.status_code} (attempt {attempt}).")
+                    continue
+                resp.raise_for_status()
+                body = resp.raw.read(decode_content=False)
+                encoding = resp.headers.get("Content-Encoding")
+            if pool is not None:
+                try:
+                    cameras, remarks = pool.submit(parse_payload, body, encoding).result()
+                except BrokenProcessPool:
+                    # a worker died (e.g. OOM-killed); parse this response here instead
+                    print("    Warning: parse worker pool is broken; parsing in-process.")
+                    cameras, remarks = parse_payload(body, encoding)
+            else:
+                cameras, remarks = parse_payload(body, encoding)
+            errors = [r for r in remarks if "runtime error" in r]
+            if errors:
+                raise OverpassRuntimeError(errors[0])
+            store_cached(cache_path(query), cameras)
+            return cameras
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, OverpassPayloadError, OverpassRuntimeError) as e:
             print(f"    Warning: fetch failed: {e}")
+            if is_mirror_failure(e):
+                MIRRORS.report_failure(url)
+                mirror += 1
+            if depth < MAX_SPLIT_DEPTH and is_query_too_large(e):
+                raise BboxTooLarge(bbox) from e
             if attempt < attempts:
-                time.sleep(backoff)
-                backoff *= 2
+                time.sleep(jittered(backoff))
+                backoff = min(backoff * 2, MAX_BACKOFF)
             else:
                 print("    Error: giving up on this bbox.")
                 return None
+    print("    Error: giving up on this bbox.")
+    return None
+
+async def fetch_bbox_async(semaphore, pool, bbox, depth=0):
+    """
+    Run the blocking fetch_bbox in a worker thread, with at most
+    MAX_CONCURRENT_FETCHES requests in flight; the request rate itself is
+    limited by BUCKET. A bbox Overpass cannot finish is split, and its quadrants
+    are scheduled as independent jobs through the same semaphore.
+    Returns (cameras, complete): cameras is None if nothing could be fetched,
+    and complete is False if any quadrant had to be skipped.
+    """
+    async with semaphore:
+        try:
+            cameras = await asyncio.to_thread(fetch_bbox, bbox, depth=depth, pool=pool)
+            return cameras, cameras is not None
+        except BboxTooLarge:
+            pass
+    print(f"    Splitting bbox {bbox} into quadrants.")
+    return await fetch_quadrants(semaphore, pool, bbox, depth + 1)
+
+async def fetch_quadrants(semaphore, pool, bbox, depth):
+    """
+    Fetch the four quadrants of bbox concurrently and merge their cameras.
+    Failed quadrants are skipped; the merged result is cached under the parent
+    query only when every quadrant is complete. Cameras are None if all quadrants fail.
+    """
+    quadrants = split_bbox(bbox)
+    # expected fetch failures come back as None; anything raised is a bug and propagates
+    parts = await asyncio.gather(*(fetch_bbox_async(semaphore, pool, q, depth) for q in quadrants))
+
+    cameras = []
+    failed = 0
+    complete = True
+    for quadrant, (part, part_complete) in zip(quadrants, parts):
+        if part is None:
+            print(f"    Skipping quadrant {quadrant} of bbox {bbox} due to fetch failures.")
+            failed += 1
+            continue
+        cameras.extend(part)
+        complete = complete and part_complete
+
+    if failed == len(quadrants):
+        return None, False
+    complete = complete and not failed
+    if complete:
+        store_cached(cache_path(build_overpass_query(bbox)), cameras)
+    return cameras, complete
+
+async def fetch_all(country_bboxes, pool):
+    """
+    Fetch every bbox of every country concurrently and group the cameras by country code.
+    Cameras are de-duplicated by id as they arrive, since bboxes of the same country may overlap.
+    Returns (results, broken): broken is the set of countries where a bbox raised an
+    unexpected exception. Their data is dropped so a bug cannot overwrite a good feed.
+    """
+    prune_cache()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    jobs = [(cc, bbox) for cc, bboxes in country_bboxes.items() for bbox in bboxes]
+    tasks = [asyncio.create_task(fetch_bbox_async(semaphore, pool, bbox)) for _, bbox in jobs]
+    # Expected fetch failures come back as None; exceptions are collected so the
+    # other countries still finish, then reported by main as a failed run.
+    responses = await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = defaultdict(CameraColumns)
+    broken = set()
+    for (cc, bbox), result in zip(jobs, responses):
+        if isinstance(result, BaseException):
+            print(f"    Error: unexpected exception fetching bbox {bbox} for {cc}:")
+            traceback.print_exception(result)
+            broken.add(cc)
+            continue
+        cameras, _ = result
+        if cameras is None:
+            print(f"    Skipping bbox {bbox} for {cc} due to fetch failures.")
+            continue
+        columns = results[cc]
+        for row in cameras:
+            columns.add(row)
+    for cc in broken:
+        results.pop(cc, None)
+    return results, broken
+
+def process_country(cc, cameras):
+    """
+    Write a country's de-duplicated cameras (a CameraColumns) to its output file.
+    """
+    final_json = {"results": cameras.records()}
+    output_file = OUTPUTS[cc]
+
+    new_bytes = dump_json(final_json)
+    if file_matches(output_file, new_bytes):
+        print(f"  Unchanged: {len(cameras)} cameras already in {output_file}")
+        return
+
+    write_atomic(output_file, new_bytes)
+
+    print(f"  Saved {len(cameras)} cameras to {output_file}")
 
 def main():
     env_countries = os.environ.get("COUNTRIES")
@@ -89,52 +585,26 @@ def main():
         print("No countries configured to fetch. Exiting.")
         return
 
+    total = sum(len(bboxes) for bboxes in country_bboxes.values())
+    print(f"Fetching {total} bbox(es) across {len(country_bboxes)} country(ies)")
+    workers = min(MAX_PARSE_WORKERS, os.cpu_count() or 1)
+    # spawn rather than fork: the fetch threads may already be running when workers start
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        fetched, broken = asyncio.run(fetch_all(country_bboxes, pool))
+
     for cc, bboxes in country_bboxes.items():
         print(f"Processing country: {cc} with {len(bboxes)} bbox(es)")
-        all_results = []
-
-        for bbox in bboxes:
-            data = fetch_bbox(bbox)
-            time.sleep(2)
-            if not data:
-                print(f"    Skipping bbox {bbox} for {cc} due to fetch failures.")
-                continue
-
-            for node in data.get("elements", []):
-                tags = node.get("tags", {})
-                if tags.get("highway") == "speed_camera":
-                    camera_type = "fixed_camera"
-                    conf = CONF_FIXED
-                else:
-                    camera_type = "mobile_possible_camera"
-                    conf = CONF_MOBILE_POSSIBLE
-
-                camera = {
-                    "id": f"osm-{node['id']}",
-                    "lat": node.get("lat"),
-                    "lon": node.get("lon"),
-                    "type": camera_type,
-                    "confidence": conf,
-                }
-                all_results.append(camera)
-
-        unique_results = {cam["id"]: cam for cam in all_results}.values()
-        final_json = {"results": list(unique_results)}
-
-        if cc == "uk":
-            output_file = os.path.join(OUTPUT_DIR, "osm_cameras.json")
-        else:
-            output_file = os.path.join(OUTPUT_DIR, f"{cc}_osm_cameras.json")
-
-        # Safety guard: only refuse if the canonical filename would be overwritten by a non-UK country
-        if os.path.basename(output_file) == "osm_cameras.json" and cc != "uk":
-            print(f"    Safety: refusing to write non-UK country {cc} to canonical osm_cameras.json; skipping write.")
+        if cc in broken:
+            print(f"    Error: unexpected failure for {cc}; keeping the existing {OUTPUTS[cc]}.")
             continue
+        if cc not in fetched:
+            # every bbox failed: an empty feed would replace good data, so leave the file alone
+            print(f"    No bbox fetched successfully for {cc}; keeping the existing {OUTPUTS[cc]}.")
+            continue
+        process_country(cc, fetched[cc])
 
-        with open(output_file, "w") as fh:
-            json.dump(final_json, fh, indent=2)
-
-        print(f"  Saved {len(final_json['results'])} cameras to {output_file}")
+    if broken:
+        raise SystemExit(f"Unexpected errors while fetching: {', '.join(sorted(broken))}")
 
 if __name__ == "__main__":
     main()